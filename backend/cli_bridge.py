@@ -15,15 +15,29 @@ Commands:
   {"cmd": "regenerate", "image_b64": "...", "params": {...}}
   {"cmd": "export", "dots": [...], "format": "png", "width": 800, "height": 800, "dot_shape": "circle"}
   {"cmd": "ping"}
+
+Binary framing (opt-in):
+  {"cmd": "ping", "binary": true} switches both directions to length-prefixed
+  frames once the pong has been written:
+
+    struct ">II" (header_len, payload_len) + header JSON + raw payload bytes
+
+  In binary mode an upload carries the image as the frame payload instead of
+  "image_b64", and an export returns the file bytes as the payload instead
+  of "data_b64" — no base64 pass on either side.  {"cmd": "ping",
+  "binary": false} switches back to newline-delimited JSON.
 """
 
 import sys
 import json
-import base64
+import struct
 import uuid
 import traceback
 import os
 import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
 
 # ── File logger ──
 # Write to home dir — the script runs from inside a read-only AppImage
@@ -47,55 +61,177 @@ logger.info("=" * 50)
 logger.info("Halftone Studio CLI Bridge starting")
 logger.info("Python %s  |  cwd: %s  |  log: %s", sys.version.split()[0], os.getcwd(), _log_file)
 
-from processing.pipeline import process_image
-from processing.svg_generator import dots_to_svg_string
-from processing.export import svg_to_png, svg_to_jpg
-
-
+# pybase64 is a SIMD-accelerated drop-in for the stdlib codec; image payloads
+# and PNG/JPG exports are multi-MB, so the codec shows up in every round-trip.
+try:
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:
+    import base64 as _base64
+
+    def b64decode(s, validate: bool = False) -> bytes:
+        return _base64.b64decode(s, validate=validate)
+
+    def b64encode_as_string(b: bytes) -> str:
+        return _base64.b64encode(b).decode("ascii")
+
+# orjson is several times faster than json on the dots-heavy responses and
+# emits bytes directly, so there is no separate UTF-8 encode.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    _loads = orjson.loads
+except ImportError:
+    def _json_default(obj):
+        if hasattr(obj, "tolist"):  # numpy arrays / scalars
+            return obj.tolist()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, default=_json_default).encode("utf-8")
+
+    _loads = json.loads
+
+# The processing modules pull in numpy, cv2, numba and cairosvg — the better
+# part of a second.  They are imported on first use (or by the prewarm thread
+# started right after "ready"), so Electron is not kept waiting on them.
+load_image = fit_to_canvas = place_dots = image_hasher = _placements = None
+dots_to_svg_string = svg_to_png = svg_to_jpg = None
+_processing_lock = threading.Lock()
+
+
+def _load_processing() -> None:
+    """Bind the processing functions above; a no-op once they are loaded."""
+    global load_image, fit_to_canvas, image_hasher, _placements
+    global dots_to_svg_string, svg_to_png, svg_to_jpg, place_dots
+    if place_dots is not None:
+        return
+    with _processing_lock:
+        if place_dots is not None:
+            return
+        from processing import pipeline, svg_generator, export
+        load_image, fit_to_canvas = pipeline.load_image, pipeline.fit_to_canvas
+        image_hasher = pipeline.image_hasher
+        _placements = pipeline.PlacementCache(size=32)
+        dots_to_svg_string = svg_generator.dots_to_svg_string
+        svg_to_png, svg_to_jpg = export.svg_to_png, export.svg_to_jpg
+        # Bound last: callers treat it as the "everything is loaded" flag
+        place_dots = pipeline.place_dots
+        logger.info("processing modules loaded")
+
+
+# dataclass(slots=True) needs Python 3.10+; the desktop app supports 3.9
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class ParamsObj:
     """Lightweight params object matching the DotParams interface."""
-    def __init__(self, d: dict):
-        self.dot_radius = d.get("dot_radius", 4.0)
-        self.min_spacing = d.get("min_spacing", 10.0)
-        self.density = d.get("density", 1.0)
-        self.method = d.get("method", "grid")
-        self.edge_strength = d.get("edge_strength", 0.6)
-        self.rotation = d.get("rotation", 0.0)
-        self.contrast = d.get("contrast", 1.2)
-        self.invert = d.get("invert", False)
-        self.use_contour_follow = d.get("use_contour_follow", False)
-        self.dot_shape = d.get("dot_shape", "circle")
-        self.sizing_mode = d.get("sizing_mode", "uniform")
-        self.canvas_width = d.get("canvas_width", 800)
-        self.canvas_height = d.get("canvas_height", 800)
-
-
-# Store uploaded images by session_id — supports multiple layers
-_image_store: dict = {}  # {session_id: raw_bytes}
+    dot_radius: float = 4.0
+    min_spacing: float = 10.0
+    density: float = 1.0
+    method: str = "grid"
+    edge_strength: float = 0.6
+    rotation: float = 0.0
+    contrast: float = 1.2
+    invert: bool = False
+    use_contour_follow: bool = False
+    dot_shape: str = "circle"
+    sizing_mode: str = "uniform"
+    canvas_width: int = 800
+    canvas_height: int = 800
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ParamsObj":
+        if d.keys() <= _PARAM_DEFAULTS.keys():
+            return cls(**{**_PARAM_DEFAULTS, **d})
+        # Ignore unknown keys rather than failing the whole request
+        return cls(**{k: d.get(k, v) for k, v in _PARAM_DEFAULTS.items()})
+
+
+_PARAM_DEFAULTS = asdict(ParamsObj())
+
+
+# Store uploaded images by session_id — supports multiple layers.
+# LRU-bounded: each entry pins the decoded image (≤ 800 px) and its
+# canvas-fitted copy.
+_IMAGE_STORE_SIZE = 8
+_image_store: "OrderedDict[str, dict]" = OrderedDict()  # {session_id: {"source", "image_hash", "decoded"}}
+
+
+def _image_entry(raw: bytes) -> dict:
+    """
+    Decoded image plus its content hash (both computed once per upload).
+    The raw bytes are not kept — the decoded, size-capped array is all
+    regenerate needs.
+    """
+    hasher = image_hasher()
+    hasher.update(raw)
+    return {"source": load_image(raw), "image_hash": hasher.digest()}
+
+
+def _store_image(sid: str, entry: dict) -> None:
+    _image_store[sid] = entry
+    _image_store.move_to_end(sid)
+    if len(_image_store) > _IMAGE_STORE_SIZE:
+        evicted, _ = _image_store.popitem(last=False)
+        logger.info("image store full — evicted session %s", evicted)
+
+
+def _process_cached(entry: dict, params: ParamsObj) -> dict:
+    """
+    Dots for a stored image, from the placement cache or computed inline.
+    The canvas-fitted image lives on the store entry, so only a canvas-size
+    change repeats fit_to_canvas().
+    """
+    result = _placements.get(entry["image_hash"], params)
+    if result is not None:
+        logger.info("cache hit (%d cached)", len(_placements))
+        return result
+
+    canvas_size = (params.canvas_width, params.canvas_height)
+    decoded = entry.get("decoded")
+    if decoded is None or decoded["canvas_size"] != canvas_size:
+        decoded = fit_to_canvas(entry["source"], *canvas_size)
+        entry["decoded"] = decoded
+
+    result = place_dots(decoded, params)
+    _placements.put(entry["image_hash"], params, result)
+    return result
+
+
+def _image_bytes(msg: dict) -> bytes:
+    """Raw image from a binary frame payload, or decoded from image_b64."""
+    if msg.get("payload"):
+        return msg["payload"]
+    logger.info("decoding image (%d chars b64)", len(msg["image_b64"]))
+    return b64decode(msg["image_b64"], validate=False)
 
 
 def handle_upload(msg: dict) -> dict:
-    logger.info("upload: decoding image (%d chars b64)", len(msg.get("image_b64", "")))
-    image_b64 = msg["image_b64"]
-    raw = base64.b64decode(image_b64)
+    _load_processing()
+    raw = _image_bytes(msg)
     cw = msg.get("canvas_width", 800)
     ch = msg.get("canvas_height", 800)
 
     logger.info("upload: processing image (%d bytes), canvas %dx%d", len(raw), cw, ch)
-    params = ParamsObj({"canvas_width": cw, "canvas_height": ch})
-    result = process_image(raw, params)
-
     # Store image by session_id for later regeneration (multi-layer)
     sid = str(uuid.uuid4())
-    _image_store[sid] = raw
+    entry = _image_entry(raw)
+    _store_image(sid, entry)
+
+    params = ParamsObj(canvas_width=cw, canvas_height=ch)
+    result = _process_cached(entry, params)
 
     logger.info("upload: done — %d dots, session=%s (total stored: %d)",
-                len(result["dots"]), sid, len(_image_store))
+                len(result["dots"]["xs"]), sid, len(_image_store))
     return {
         "ok": True,
         "session_id": sid,
         "dots": result["dots"],
-        "dot_count": len(result["dots"]),
+        "dot_count": len(result["dots"]["xs"]),
         "image_width": result["image_width"],
         "image_height": result["image_height"],
         "canvas_width": cw,
@@ -105,37 +241,44 @@ def handle_upload(msg: dict) -> dict:
 
 def handle_regenerate(msg: dict) -> dict:
     logger.info("regenerate: starting")
+    _load_processing()
     sid = msg.get("session_id")
 
-    # Allow passing image_b64 again, or reuse stored by session_id
-    if "image_b64" in msg and msg["image_b64"]:
-        raw = base64.b64decode(msg["image_b64"])
+    # Allow passing the image again, or reuse stored by session_id
+    if msg.get("payload") or msg.get("image_b64"):
+        raw = _image_bytes(msg)
+        entry = _image_entry(raw)
         if sid:
-            _image_store[sid] = raw
-    elif sid and sid in _image_store:
-        raw = _image_store[sid]
+            _store_image(sid, entry)
+    elif sid:
+        entry = _image_store.get(sid)
+        if entry is None:
+            logger.warning("regenerate: session %s not in memory", sid)
+            return {"ok": False, "error": "Image no longer in memory. Upload it again."}
+        _image_store.move_to_end(sid)
     else:
-        # Fallback: try any stored image
+        # Fallback: most recently used image
         if _image_store:
-            raw = next(iter(_image_store.values()))
+            entry = next(reversed(_image_store.values()))
         else:
             logger.warning("regenerate: no image in memory")
             return {"ok": False, "error": "No image in memory. Upload first."}
 
-    params = ParamsObj(msg.get("params", {}))
-    result = process_image(raw, params)
+    params = ParamsObj.from_dict(msg.get("params", {}))
+    result = _process_cached(entry, params)
 
-    logger.info("regenerate: done — %d dots", len(result["dots"]))
+    logger.info("regenerate: done — %d dots", len(result["dots"]["xs"]))
     return {
         "ok": True,
         "dots": result["dots"],
-        "dot_count": len(result["dots"]),
+        "dot_count": len(result["dots"]["xs"]),
         "image_width": result["image_width"],
         "image_height": result["image_height"],
     }
 
 
 def handle_export(msg: dict) -> dict:
+    _load_processing()
     dots = msg.get("dots", [])
     fmt = msg.get("format", "svg").lower()
     width = msg.get("width", 800)
@@ -152,68 +295,142 @@ def handle_export(msg: dict) -> dict:
         return {
             "ok": True,
             "format": "svg",
-            "data_b64": base64.b64encode(svg_string.encode("utf-8")).decode("ascii"),
+            "payload": svg_string.encode("utf-8"),
         }
     elif fmt == "png":
         png_bytes = svg_to_png(svg_string)
         return {
             "ok": True,
             "format": "png",
-            "data_b64": base64.b64encode(png_bytes).decode("ascii"),
+            "payload": png_bytes,
         }
     elif fmt == "jpg":
         jpg_bytes = svg_to_jpg(svg_string)
         return {
             "ok": True,
             "format": "jpg",
-            "data_b64": base64.b64encode(jpg_bytes).decode("ascii"),
+            "payload": jpg_bytes,
         }
     else:
         return {"ok": False, "error": f"Unsupported format: {fmt}"}
 
 
+def handle_ping(msg: dict) -> dict:
+    resp = {"ok": True, "pong": True}
+    if "binary" in msg:
+        resp["binary"] = bool(msg["binary"])
+    return resp
+
+
+_HANDLERS = {
+    "ping": handle_ping,
+    "upload": handle_upload,
+    "regenerate": handle_regenerate,
+    "export": handle_export,
+}
+
+
+# Binary frame prefix: header JSON length, payload length (both big-endian u32)
+_FRAME_HEADER = struct.Struct(">II")
+
+
+def _read_frame(stream):
+    """Read one binary frame. Returns (header_json, payload) or None on EOF."""
+    head = stream.read(_FRAME_HEADER.size)
+    if len(head) < _FRAME_HEADER.size:
+        return None
+    header_len, payload_len = _FRAME_HEADER.unpack(head)
+    header = stream.read(header_len)
+    payload = stream.read(payload_len) if payload_len else b""
+    return header, payload
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until done — a single syscall in the common case."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_response(fd: int, resp: dict, binary: bool) -> int:
+    """
+    Write one response straight to the fd. Returns the number of bytes written.
+
+    Every command has a caller waiting on its reply, so there is nothing to
+    coalesce: each response is assembled into one buffer and handed to
+    os.write, bypassing Python's buffered writer and its flush.
+
+    A "payload" entry (raw file bytes) goes out as the frame payload in
+    binary mode, or as base64 under "data_b64" in JSON-lines mode.
+    """
+    payload = resp.pop("payload", b"")
+    if binary:
+        header = _dumps(resp)
+        data = b"".join((_FRAME_HEADER.pack(len(header), len(payload)), header, payload))
+    else:
+        if payload:
+            resp["data_b64"] = b64encode_as_string(payload)
+        data = _dumps(resp) + b"\n"
+    _write_all(fd, data)
+    return len(data)
+
+
 def main():
+    # Byte-level I/O: frames carry raw image bytes, which the text wrappers
+    # would try to decode.  BufferedReader.readline splits on b"\n" in C
+    # without decoding; responses bypass sys.stdout entirely (_write_all).
+    stdin, stdout = sys.stdin.buffer, sys.stdout.fileno()
+    binary = False
+
     logger.info("main loop starting — sending ready signal")
     # Signal ready
-    sys.stdout.write(json.dumps({"status": "ready"}) + "\n")
-    sys.stdout.flush()
-
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
+    _write_response(stdout, {"status": "ready"}, binary)
+    # Warm the imports while Electron is still drawing its window
+    threading.Thread(target=_load_processing, name="prewarm", daemon=True).start()
+
+    while True:
+        if binary:
+            frame = _read_frame(stdin)
+            if frame is None:
+                break
+            header, payload = frame
+        else:
+            line = stdin.readline()
+            if not line:
+                break
+            header, payload = line.strip(), b""
+            if not header:
+                continue
 
         try:
-            msg = json.loads(line)
+            msg = _loads(header)
         except json.JSONDecodeError as e:
             logger.error("Invalid JSON input: %s", e)
-            resp = {"ok": False, "error": f"Invalid JSON: {e}"}
-            sys.stdout.write(json.dumps(resp) + "\n")
-            sys.stdout.flush()
+            _write_response(stdout, {"ok": False, "error": f"Invalid JSON: {e}"}, binary)
             continue
 
+        if payload:
+            msg["payload"] = payload
         cmd = msg.get("cmd", "")
         logger.info("Received command: %s", cmd)
 
         try:
-            if cmd == "ping":
-                resp = {"ok": True, "pong": True}
-            elif cmd == "upload":
-                resp = handle_upload(msg)
-            elif cmd == "regenerate":
-                resp = handle_regenerate(msg)
-            elif cmd == "export":
-                resp = handle_export(msg)
+            handler = _HANDLERS.get(cmd)
+            if handler is not None:
+                resp = handler(msg)
             else:
                 resp = {"ok": False, "error": f"Unknown command: {cmd}"}
         except Exception:
             logger.exception("Unhandled exception for cmd=%s", cmd)
             resp = {"ok": False, "error": traceback.format_exc()}
 
-        resp_json = json.dumps(resp)
-        logger.info("Sending response (%d bytes) for cmd=%s", len(resp_json), cmd)
-        sys.stdout.write(resp_json + "\n")
-        sys.stdout.flush()
+        size = _write_response(stdout, resp, binary)
+        logger.info("Sending response (%d bytes) for cmd=%s", size, cmd)
+
+        # The pong itself still goes out in the old mode; switch afterwards
+        if cmd == "ping" and "binary" in resp:
+            binary = resp["binary"]
+            logger.info("Protocol: %s", "binary frames" if binary else "JSON lines")
 
 
 if __name__ == "__main__":
@@ -3,19 +3,27 @@ Rhinestone / Halftone Pattern Generator — FastAPI Backend
 Converts images into editable dot patterns suitable for clothing production.
 """
 
-import io
+import os
 import uuid
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
 import numpy as np
+import orjson
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
-from processing.pipeline import process_image
+from processing.pipeline import load_image, fit_to_canvas, place_dots, image_hasher, PlacementCache
 from processing.svg_generator import generate_svg, dots_to_svg_string
 from processing.export import svg_to_png, svg_to_jpg
 
@@ -25,10 +33,63 @@ from processing.export import svg_to_png, svg_to_jpg
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CPU-bound work (decode / placement, SVG rasterization) runs in worker processes
+# so it never blocks the event loop and scales past a single core.
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_worker():
+    """Pool initializer: pay the numpy / cv2 import cost once per worker."""
+    import processing.pipeline  # noqa: F401
+    import processing.export  # noqa: F401
+    from processing.dot_placement import set_poisson_threads
+
+    # One worker per core already; sampling threads would oversubscribe
+    set_poisson_threads(1)
+
+
+def _place_in_worker(decoded: dict, params: dict) -> dict:
+    # Params travel as a plain dict; place_dots only needs attribute access
+    return place_dots(decoded, SimpleNamespace(**params))
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_warm_worker)
+
+
+async def _run_in_pool(fn, *args):
+    global _pool
+    pool = _pool
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM kill, native crash on a hostile image) and took
+        # the pool down with it.  Fail this request but start a fresh pool,
+        # so later requests don't all hit the broken one.  Every request
+        # in flight sees the same error; only the first one replaces it.
+        if _pool is pool:
+            logger.error("Worker pool broke — restarting it")
+            pool.shutdown(wait=False, cancel_futures=True)
+            _pool = _new_pool()
+        raise
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _pool
+    _pool = _new_pool()
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
 app = FastAPI(
     title="Halftone Studio",
     version="1.0.0",
     description="Convert any image/logo into halftone dot patterns with variable sizing",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -39,8 +100,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for processed sessions (swap for Redis/DB later)
-sessions: dict = {}
+# In-memory store for processed sessions (swap for Redis/DB later).
+# LRU + idle TTL: each session pins a decoded image, so abandoned ones must
+# not accumulate in a long-running server.
+_SESSIONS_MAX = 256
+_SESSION_TTL = 3600.0  # seconds since last use
+sessions: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def _put_session(session_id: str, session: dict) -> None:
+    now = time.monotonic()
+    session["touched"] = now
+    sessions[session_id] = session
+    # Least recently used first, so expired sessions are always at the front
+    while sessions:
+        oldest = next(iter(sessions.values()))
+        if len(sessions) <= _SESSIONS_MAX and now - oldest["touched"] <= _SESSION_TTL:
+            break
+        sessions.popitem(last=False)
+
+
+def _get_session(session_id: str) -> Optional[dict]:
+    session = sessions.get(session_id)
+    if session is None:
+        return None
+    now = time.monotonic()
+    if now - session["touched"] > _SESSION_TTL:
+        del sessions[session_id]
+        return None
+    session["touched"] = now
+    sessions.move_to_end(session_id)
+    return session
+
+
+# Shared by all sessions: two uploads of the same image hit the same entries
+_placements = PlacementCache(size=32)
+
+
+async def _process_cached(session: dict, params: "DotParams") -> dict:
+    """
+    Dots for a session's image, from the placement cache or the worker pool.
+    The canvas-fitted image lives on the session, so only a canvas-size
+    change sends fit_to_canvas() to a worker again.
+    """
+    result = _placements.get(session["image_hash"], params)
+    if result is not None:
+        return result
+
+    canvas_size = (params.canvas_width, params.canvas_height)
+    decoded = session.get("decoded")
+    if decoded is None or decoded["canvas_size"] != canvas_size:
+        decoded = await _run_in_pool(fit_to_canvas, session["source"], *canvas_size)
+        session["decoded"] = decoded
+
+    result = await _run_in_pool(_place_in_worker, decoded, params.model_dump())
+    _placements.put(session["image_hash"], params, result)
+    return result
+
+
+def _json(body: dict) -> Response:
+    """
+    JSON response via orjson: the dots arrays are serialized far faster than
+    by the stdlib encoder, and the numpy columns are written natively.
+    """
+    return Response(orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
+
 
 # ---------------------------------------------------------------------------
 # Request / Response models
@@ -90,6 +214,9 @@ async def health():
     return {"status": "ok"}
 
 
+_UPLOAD_CHUNK = 1 << 20  # 1 MiB
+
+
 @app.post("/api/upload")
 async def upload_image(
     file: UploadFile = File(...),
@@ -100,31 +227,45 @@ async def upload_image(
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    contents = await file.read()
+    # Read the (already spooled) upload in chunks, hashing as we go so the
+    # image bytes are only walked once.  Hashed once per session, so
+    # regenerate never re-hashes megabytes per call.
+    contents = bytearray()
+    hasher = image_hasher()
+    while chunk := await file.read(_UPLOAD_CHUNK):
+        contents.extend(chunk)
+        hasher.update(chunk)
+    image_hash = hasher.digest()
     session_id = str(uuid.uuid4())
 
     try:
         # Run full processing pipeline with default params
         params = DotParams(canvas_width=canvas_width, canvas_height=canvas_height)
-        result = process_image(contents, params)
-
-        sessions[session_id] = {
-            "raw_image": contents,
+        # Keep the decoded, size-capped image rather than the upload bytes —
+        # a few MB at most, and regenerate never has to imdecode again.
+        source = await _run_in_pool(load_image, contents)
+        del contents
+        session = {"source": source, "image_hash": image_hash}
+        result = await _process_cached(session, params)
+
+        session.update({
             "dots": result["dots"],
             "params": params.model_dump(),
             "image_width": result["image_width"],
             "image_height": result["image_height"],
-        }
+        })
+        _put_session(session_id, session)
 
-        return {
+        # Returned directly so the numpy dot columns skip jsonable_encoder
+        return _json({
             "session_id": session_id,
             "dots": result["dots"],
-            "dot_count": len(result["dots"]),
+            "dot_count": len(result["dots"]["xs"]),
             "image_width": result["image_width"],
             "image_height": result["image_height"],
             "canvas_width": params.canvas_width,
             "canvas_height": params.canvas_height,
-        }
+        })
 
     except Exception as e:
         logger.exception("Processing failed")
@@ -134,22 +275,22 @@ async def upload_image(
 @app.post("/api/regenerate")
 async def regenerate_dots(req: RegenerateRequest):
     """Regenerate dot pattern with new parameters."""
-    session = sessions.get(req.session_id)
+    session = _get_session(req.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        result = process_image(session["raw_image"], req.params)
+        result = await _process_cached(session, req.params)
         session["dots"] = result["dots"]
         session["params"] = req.params.model_dump()
 
-        return {
+        return _json({
             "session_id": req.session_id,
             "dots": result["dots"],
-            "dot_count": len(result["dots"]),
+            "dot_count": len(result["dots"]["xs"]),
             "image_width": result["image_width"],
             "image_height": result["image_height"],
-        }
+        })
 
     except Exception as e:
         logger.exception("Regeneration failed")
@@ -159,7 +300,7 @@ async def regenerate_dots(req: RegenerateRequest):
 @app.post("/api/dots/update")
 async def update_dots(req: DotEditRequest):
     """Save edited dot positions from the frontend editor."""
-    session = sessions.get(req.session_id)
+    session = _get_session(req.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -170,7 +311,7 @@ async def update_dots(req: DotEditRequest):
 @app.post("/api/export")
 async def export_pattern(req: ExportRequest):
     """Export the dot pattern as SVG / PNG / JPG."""
-    session = sessions.get(req.session_id)
+    session = _get_session(req.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -182,22 +323,22 @@ async def export_pattern(req: ExportRequest):
     svg_string = dots_to_svg_string(dots, req.width, req.height, bg_color=bg, dot_shape=req.dot_shape)
 
     if fmt == "svg":
-        return StreamingResponse(
-            io.BytesIO(svg_string.encode("utf-8")),
+        return Response(
+            content=svg_string.encode("utf-8"),
             media_type="image/svg+xml",
             headers={"Content-Disposition": "attachment; filename=rhinestone.svg"},
         )
     elif fmt == "png":
-        png_bytes = svg_to_png(svg_string)
-        return StreamingResponse(
-            io.BytesIO(png_bytes),
+        png_bytes = await _run_in_pool(svg_to_png, svg_string)
+        return Response(
+            content=png_bytes,
             media_type="image/png",
             headers={"Content-Disposition": "attachment; filename=rhinestone.png"},
         )
     elif fmt == "jpg":
-        jpg_bytes = svg_to_jpg(svg_string)
-        return StreamingResponse(
-            io.BytesIO(jpg_bytes),
+        jpg_bytes = await _run_in_pool(svg_to_jpg, svg_string)
+        return Response(
+            content=jpg_bytes,
             media_type="image/jpeg",
             headers={"Content-Disposition": "attachment; filename=rhinestone.jpg"},
         )
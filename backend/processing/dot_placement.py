@@ -6,101 +6,140 @@ Every algorithm receives:
   density_map  – 0-255 inside the shape (higher ⇒ denser/larger dots)
   params       – DotParams from the API
 
+and returns a Dots set (parallel x / y / r arrays).
 Dots are NEVER placed outside the mask.
 """
 
 import math
+import os
 import random
+import threading
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 
 import cv2
 import numpy as np
+from scipy.spatial import cKDTree
+
+# Numba compiles the placement kernels to machine code.  Without it the same
+# functions run as plain (slow but correct) Python.  Kernels carry explicit
+# signatures so they compile (or load from the on-disk cache) at import —
+# i.e. in the worker / bridge warm-up — rather than on the first request.
+try:
+    from numba import njit
+    _JIT = True
+except ImportError:
+    _JIT = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 
 
 # ======================================================================
 # Helpers
 # ======================================================================
 
-def _rotate_points(pts: list, angle_deg: float, cx: float, cy: float) -> list:
-    if angle_deg == 0:
-        return pts
-    rad = math.radians(angle_deg)
-    c, s = math.cos(rad), math.sin(rad)
-    out = []
-    for p in pts:
-        dx, dy = p["x"] - cx, p["y"] - cy
-        out.append({
-            "x": round(dx * c - dy * s + cx, 2),
-            "y": round(dx * s + dy * c + cy, 2),
-            "r": p["r"],
-        })
-    return out
-
-
-def _in_mask(mask: np.ndarray, x: float, y: float) -> bool:
-    h, w = mask.shape[:2]
-    xi, yi = int(round(x)), int(round(y))
-    if xi < 0 or xi >= w or yi < 0 or yi >= h:
-        return False
-    return mask[yi, xi] > 127
+@dataclass
+class Dots:
+    """
+    A set of dots as parallel float64 arrays (structure of arrays) — no
+    per-dot objects between placement and the wire.  Coordinates are kept
+    rounded to 2 decimals, as the dict-per-dot format was.
+    """
+    xs: np.ndarray
+    ys: np.ndarray
+    rs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    @classmethod
+    def empty(cls) -> "Dots":
+        return cls(np.empty(0), np.empty(0), np.empty(0))
+
+    @classmethod
+    def concat(cls, parts: list) -> "Dots":
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([p.xs for p in parts]),
+            np.concatenate([p.ys for p in parts]),
+            np.concatenate([p.rs for p in parts]),
+        )
 
+    def take(self, idx) -> "Dots":
+        """Subset by index array or boolean mask."""
+        return Dots(self.xs[idx], self.ys[idx], self.rs[idx])
 
-def _density_at(density_map: np.ndarray, x: float, y: float) -> float:
-    h, w = density_map.shape[:2]
-    xi = max(0, min(int(x), w - 1))
-    yi = max(0, min(int(y), h - 1))
-    return density_map[yi, xi] / 255.0
+    def xy(self) -> np.ndarray:
+        return np.column_stack((self.xs, self.ys))
 
 
-def remove_overlaps_spatial(dots: list, min_dist: float) -> list:
-    """Fast-ish greedy overlap removal using a grid index."""
+def _rotate_points(dots: Dots, angle_deg: float, cx: float, cy: float) -> Dots:
+    if angle_deg == 0 or not len(dots):
+        return dots
+    rad = math.radians(angle_deg)
+    c, s = math.cos(rad), math.sin(rad)
+    # One (N, 2) @ (2, 2) product
+    centre = np.array([cx, cy])
+    rot = np.round((dots.xy() - centre) @ np.array([[c, s], [-s, c]]) + centre, 2)
+    return Dots(rot[:, 0].copy(), rot[:, 1].copy(), dots.rs)
+
+
+@njit("boolean[:](int64, int64[:, :])", cache=True)
+def _greedy_keep(n: int, pairs: np.ndarray) -> np.ndarray:
+    # pairs are (i, j) with i < j, sorted by i: by the time i's pairs come
+    # up, every earlier dot that could knock i out has been decided.
+    keep = np.ones(n, np.bool_)
+    for k in range(pairs.shape[0]):
+        i, j = pairs[k, 0], pairs[k, 1]
+        if keep[i] and keep[j]:
+            keep[j] = False
+    return keep
+
+
+def remove_overlaps_spatial(
+    dots: Dots, min_dist: float, groups: Optional[np.ndarray] = None
+) -> Dots:
+    """
+    Greedy overlap removal: walk the dots in order and drop any dot closer
+    than min_dist to one already kept.  Close pairs come from a KD-tree.
+    With *groups* (a label per dot), only pairs from different groups count.
+    """
     if len(dots) < 2:
         return dots
 
-    # Build spatial grid for O(1) neighbour lookup
-    cell = max(min_dist, 1.0)
-    grid: dict = {}
-
-    def _key(x, y):
-        return (int(x // cell), int(y // cell))
-
-    kept: list = []
-    for d in dots:
-        kx, ky = _key(d["x"], d["y"])
-        too_close = False
-        for dx in range(-2, 3):
-            for dy in range(-2, 3):
-                for other in grid.get((kx + dx, ky + dy), []):
-                    ddx = d["x"] - other["x"]
-                    ddy = d["y"] - other["y"]
-                    if ddx * ddx + ddy * ddy < min_dist * min_dist:
-                        too_close = True
-                        break
-                if too_close:
-                    break
-            if too_close:
-                break
-        if not too_close:
-            kept.append(d)
-            grid.setdefault((kx, ky), []).append(d)
+    n = len(dots)
+    pts = dots.xy()
+    pairs = cKDTree(pts).query_pairs(min_dist, output_type="ndarray")
+    # query_pairs is inclusive; the overlap test is strict
+    delta = pts[pairs[:, 0]] - pts[pairs[:, 1]]
+    pairs = pairs[np.einsum("ij,ij->i", delta, delta) < min_dist * min_dist]
+    if groups is not None:
+        pairs = pairs[groups[pairs[:, 0]] != groups[pairs[:, 1]]]
+    pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
 
-    return kept
+    return dots.take(_greedy_keep(n, pairs))
 
 
 # ======================================================================
 # Helpers — size & spacing from density
 # ======================================================================
 
-def _dot_radius(base_r: float, density: float, dens_mult: float, sizing_mode: str = "variable") -> float:
+@njit("float64(float64, float64, float64, boolean)", cache=True)
+def _radius_for(base_r: float, density: float, dens_mult: float, variable: bool) -> float:
     """
     Compute dot radius from density value (0..1).
-    If sizing_mode == "uniform", always returns base_r.
-    If sizing_mode == "variable":
+    If not variable (sizing_mode == "uniform"), always returns base_r.
+    If variable:
       Shadow/dark areas (density ~1.0) → large dots.
       Highlight/light areas (density ~0.0) → small or no dots.
     """
-    if sizing_mode == "uniform":
+    if not variable:
         return round(base_r, 2)
 
     min_factor = 0.2
@@ -111,6 +150,16 @@ def _dot_radius(base_r: float, density: float, dens_mult: float, sizing_mode: st
     return round(max(base_r * 0.15, base_r * factor), 2)
 
 
+def _radii(base_r: float, density: np.ndarray, dens_mult: float, variable: bool) -> np.ndarray:
+    """Vectorised :func:`_radius_for` over an array of densities."""
+    if not variable:
+        return np.full(len(density), round(base_r, 2))
+    max_factor = min(1.0 + dens_mult * 0.8, 2.5)
+    factor = 0.2 + density * (max_factor - 0.2)
+    return np.round(np.maximum(base_r * 0.15, base_r * factor), 2)
+
+
+@njit("float64(float64, float64, float64)", cache=True)
 def _local_spacing(base_spacing: float, density: float, dens_mult: float) -> float:
     """
     Compute local spacing from density. Dense/dark areas → tighter spacing.
@@ -124,107 +173,190 @@ def _local_spacing(base_spacing: float, density: float, dens_mult: float) -> flo
 # 1. Poisson Disk Sampling — mask-aware
 # ======================================================================
 
-def place_dots_poisson(
-    mask: np.ndarray,
-    density_map: np.ndarray,
-    params,
-) -> List[Dict]:
-    """
-    Density-aware Poisson-disk sampling.
-    Dots are ONLY placed where mask == 255.
-    Spacing adapts: denser regions ⇒ tighter packing.
+@njit(
+    "UniTuple(float64[:], 3)(boolean[:, :], uint8[:, :], float64, float64, float64,"
+    " boolean, float64, float64, int64, int64, int64)",
+    cache=True, nogil=True,
+)
+def _poisson_core(inside, density_map, base_r, min_spacing, dens_mult, variable,
+                  seed_x, seed_y, rng_seed, k, max_dots):
     """
-    h, w = mask.shape[:2]
-    base_r      = params.dot_radius
-    min_spacing = params.min_spacing
-    dens_mult   = params.density
-    sizing_mode = getattr(params, 'sizing_mode', 'variable')
-    k = 12  # candidates per active point (lower = faster)
-
-    # Use minimum possible spacing for the grid cell size
-    min_possible_sp = min_spacing * 0.5
-    cell_size = min_possible_sp / math.sqrt(2)
-    gw = math.ceil(w / cell_size)
-    gh = math.ceil(h / cell_size)
-    grid = [None] * (gw * gh)
+    Bridson sampling on flat arrays: the grid holds the coordinates of the
+    dot occupying each cell (NaN when empty) and the active list is an int32
+    array managed by hand, so nothing inside the loop touches a Python object.
 
-    dots: List[Dict] = []
-    active: list = []
+    Each iteration either adds a dot or retires an active point, so the loop
+    runs at most 2 * max_dots times — no wall-clock limit needed.
 
-    MAX_DOTS = 8000  # safety limit
-    TIME_LIMIT = 15.0  # seconds
-    start_time = time.time()
-
-    def _gi(px, py):
-        return int(py / cell_size) * gw + int(px / cell_size)
-
-    def _add(px, py, pr):
-        idx = _gi(px, py)
-        if 0 <= idx < len(grid):
-            grid[idx] = len(dots)
-        d = {"x": round(px, 2), "y": round(py, 2), "r": round(pr, 2)}
-        dots.append(d)
-        active.append(d)
-
-    # --- seed: pick random foreground pixel ---
-    fg_ys, fg_xs = np.where(mask > 127)
-    if len(fg_ys) == 0:
-        return []
-    seed_idx = random.randint(0, len(fg_ys) - 1)
-    sx, sy = float(fg_xs[seed_idx]), float(fg_ys[seed_idx])
-    _add(sx, sy, base_r)
-
-    while active:
-        if len(dots) >= MAX_DOTS or (time.time() - start_time) > TIME_LIMIT:
-            break
+    Returns (xs, ys, rs) trimmed to the number of dots placed.
+    """
+    np.random.seed(rng_seed)
+    h, w = inside.shape
 
-        ai = random.randint(0, len(active) - 1)
-        pt = active[ai]
+    # Use minimum possible spacing for the grid cell size
+    cell_size = min_spacing * 0.5 / math.sqrt(2.0)
+    gw = int(math.ceil(w / cell_size))
+    gh = int(math.ceil(h / cell_size))
+    # Cells are small enough to hold at most one dot.  Storing its
+    # coordinates in place (rather than an index into xs/ys) keeps the
+    # neighbour check to contiguous loads, and an empty cell's NaN fails the
+    # distance compare on its own — no occupancy branch.
+    grid_x = np.full(gw * gh, np.nan)
+    grid_y = np.full(gw * gh, np.nan)
+
+    xs = np.empty(max_dots, np.float64)
+    ys = np.empty(max_dots, np.float64)
+    rs = np.empty(max_dots, np.float64)
+    active = np.empty(max_dots, np.int32)
+
+    xs[0], ys[0], rs[0] = seed_x, seed_y, base_r
+    seed_cell = int(seed_y / cell_size) * gw + int(seed_x / cell_size)
+    grid_x[seed_cell], grid_y[seed_cell] = seed_x, seed_y
+    active[0] = 0
+    n = 1
+    n_active = 1
+
+    while n_active > 0 and n < max_dots:
+        ai = np.random.randint(0, n_active)
+        pi = active[ai]
+        px, py = xs[pi], ys[pi]
         found = False
 
-        loc_d = _density_at(density_map, pt["x"], pt["y"])
+        loc_d = density_map[min(int(py), h - 1), min(int(px), w - 1)] / 255.0
         loc_sp = _local_spacing(min_spacing, loc_d, dens_mult)
+        loc_sp2 = loc_sp * loc_sp
 
         for _ in range(k):
-            angle = random.uniform(0, 2 * math.pi)
-            dist  = random.uniform(loc_sp, loc_sp * 2)
-            nx = pt["x"] + dist * math.cos(angle)
-            ny = pt["y"] + dist * math.sin(angle)
+            angle = np.random.random() * 2.0 * math.pi
+            dist  = loc_sp + np.random.random() * loc_sp
+            nx = px + dist * math.cos(angle)
+            ny = py + dist * math.sin(angle)
 
             # *** CRITICAL: must be inside the mask ***
-            if not _in_mask(mask, nx, ny):
+            xi, yi = int(round(nx)), int(round(ny))
+            if xi < 0 or xi >= w or yi < 0 or yi >= h or not inside[yi, xi]:
                 continue
 
-            d = _density_at(density_map, nx, ny)
-
-            # Neighbour collision check
+            # Neighbour collision check: always scan the full 5x5 block.  An
+            # early exit saves little on 25 cells and the scan stays a
+            # straight run of loads and compares the compiler can schedule.
             gi_x, gi_y = int(nx / cell_size), int(ny / cell_size)
+            i0, i1 = max(gi_x - 2, 0), min(gi_x + 3, gw)
+            j0, j1 = max(gi_y - 2, 0), min(gi_y + 3, gh)
             too_close = False
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    ni, nj = gi_x + dx, gi_y + dy
-                    if 0 <= ni < gw and 0 <= nj < gh:
-                        cell = grid[nj * gw + ni]
-                        if cell is not None:
-                            o = dots[cell]
-                            ddx = nx - o["x"]
-                            ddy = ny - o["y"]
-                            if ddx * ddx + ddy * ddy < loc_sp * loc_sp:
-                                too_close = True
-                                break
-                    if too_close:
-                        break
-                if too_close:
-                    break
+            for nj in range(j0, j1):
+                row = nj * gw
+                for ni in range(i0, i1):
+                    ddx = nx - grid_x[row + ni]
+                    ddy = ny - grid_y[row + ni]
+                    too_close |= ddx * ddx + ddy * ddy < loc_sp2
 
             if not too_close:
-                r = _dot_radius(base_r, d, dens_mult, sizing_mode)
-                _add(nx, ny, r)
+                d = density_map[max(0, min(int(ny), h - 1)), max(0, min(int(nx), w - 1))] / 255.0
+                xs[n], ys[n] = nx, ny
+                rs[n] = _radius_for(base_r, d, dens_mult, variable)
+                grid_x[gi_y * gw + gi_x] = nx
+                grid_y[gi_y * gw + gi_x] = ny
+                active[n_active] = n
+                n += 1
+                n_active += 1
                 found = True
                 break
 
         if not found:
-            active.pop(ai)
+            n_active -= 1
+            active[ai] = active[n_active]
+
+    return xs[:n], ys[:n], rs[:n]
+
+
+# Mask components sample on one thread pool shared by every call in the
+# process, so concurrent requests never add up to more threads than this.
+# Without Numba the kernel holds the GIL, so threads would only contend.
+_poisson_threads = (os.cpu_count() or 1) if _JIT else 1
+_poisson_pool: Optional[ThreadPoolExecutor] = None
+_poisson_pool_lock = threading.Lock()
+
+
+def set_poisson_threads(n: int) -> None:
+    """
+    Cap the threads used to sample mask components (1 = serial).  Call it
+    before placing any dots — e.g. in process-pool workers, where the pool
+    already keeps every core busy.
+    """
+    global _poisson_threads
+    _poisson_threads = max(1, n) if _JIT else 1
+
+
+def _component_pool() -> ThreadPoolExecutor:
+    global _poisson_pool
+    with _poisson_pool_lock:
+        if _poisson_pool is None:
+            _poisson_pool = ThreadPoolExecutor(_poisson_threads, thread_name_prefix="poisson")
+        return _poisson_pool
+
+
+def place_dots_poisson(
+    mask: np.ndarray,
+    density_map: np.ndarray,
+    params,
+    inside: Optional[np.ndarray] = None,
+) -> Dots:
+    """
+    Density-aware Poisson-disk sampling.
+    Dots are ONLY placed where mask == 255.
+    Spacing adapts: denser regions ⇒ tighter packing.
+    Pass *inside* (mask > 127) if the caller already has it.
+    """
+    h, w = mask.shape[:2]
+    sizing_mode = getattr(params, 'sizing_mode', 'variable')
+    k = 12  # candidates per active point (lower = faster)
+    MAX_DOTS = 8000  # safety limit
+
+    if inside is None:
+        inside = mask > 127  # one threshold pass instead of one per candidate
+
+    # A sampler only grows outward from its seed, so each disconnected blob
+    # (e.g. the letters of a logo) gets its own seed and its own run on its
+    # bounding box.  The dot budget is shared out by area.
+    n_cc, labels, stats, _ = cv2.connectedComponentsWithStats(inside.view(np.uint8), connectivity=8)
+    comps = [i for i in range(1, n_cc) if stats[i, cv2.CC_STAT_AREA] >= 15]
+    if not comps:
+        return Dots.empty()
+    total_area = int(stats[comps, cv2.CC_STAT_AREA].sum())
+
+    jobs = []
+    for i in comps:
+        x, y, cw, ch, area = (int(v) for v in stats[i])
+        sub = labels[y:y + ch, x:x + cw] == i
+        # --- seed: pick random foreground pixel ---
+        seed = np.flatnonzero(sub)[random.randint(0, area - 1)]
+        jobs.append((x, y, (
+            sub, density_map[y:y + ch, x:x + cw],
+            float(params.dot_radius), float(params.min_spacing), float(params.density),
+            sizing_mode != "uniform",
+            float(seed % cw), float(seed // cw),
+            random.getrandbits(31), k, max(1, MAX_DOTS * area // total_area),
+        )))
+
+    def run(job):
+        x, y, args = job
+        xs, ys, rs = _poisson_core(*args)
+        return Dots(xs + x, ys + y, rs)
+
+    # The kernel releases the GIL, so components sample in parallel threads.
+    if len(jobs) == 1 or _poisson_threads == 1:
+        parts = [run(job) for job in jobs]
+    else:
+        parts = list(_component_pool().map(run, jobs))
+
+    dots = Dots.concat(parts)
+    dots = Dots(np.round(dots.xs, 2), np.round(dots.ys, 2), dots.rs)
+    if len(parts) > 1:
+        # Blobs were sampled independently; across a narrow gap, thin out
+        # dots closer than the tightest spacing the sampler itself allows.
+        groups = np.repeat(np.arange(len(parts)), [len(p) for p in parts])
+        dots = remove_overlaps_spatial(dots, params.min_spacing * 0.5, groups)
 
     if params.rotation != 0:
         dots = _rotate_points(dots, params.rotation, w / 2, h / 2)
@@ -236,13 +368,25 @@ def place_dots_poisson(
 # 2. Grid Sampling — mask-aware
 # ======================================================================
 
+def _lattice(start: float, step: float, limit: float) -> np.ndarray:
+    """``start, start+step, …`` below ``limit``, summed step by step."""
+    out = []
+    v = start
+    while v < limit:
+        out.append(v)
+        v += step
+    return np.array(out)
+
+
 def place_dots_grid(
     mask: np.ndarray,
     density_map: np.ndarray,
     params,
-) -> List[Dict]:
+    inside: Optional[np.ndarray] = None,
+) -> Dots:
     """
     Uniform grid — only inside mask.  Size modulated by density.
+    Pass *inside* (mask > 127) if the caller already has it.
     """
     h, w  = mask.shape[:2]
     base_r   = params.dot_radius
@@ -250,26 +394,30 @@ def place_dots_grid(
     dens_mult = params.density
     sizing_mode = getattr(params, 'sizing_mode', 'variable')
 
-    dots: List[Dict] = []
-    y = spacing / 2
-    row = 0
-    while y < h:
-        # Hex-offset: even rows shifted half-spacing for organic feel
-        x_off = (spacing / 2) if row % 2 == 0 else 0
-        x = x_off + spacing / 2
-        while x < w:
-            if _in_mask(mask, x, y):
-                d = _density_at(density_map, x, y)
-                r = _dot_radius(base_r, d, dens_mult, sizing_mode)
-                dots.append({
-                    "x": round(x, 2),
-                    "y": round(y, 2),
-                    "r": round(r, 2),
-                })
-            x += spacing
-        y += spacing
-        row += 1
-
+    # Lattice coordinates, accumulated exactly as a row-by-row walk would.
+    # Hex-offset: even rows shifted half-spacing for organic feel
+    row_ys = _lattice(spacing / 2, spacing, h)
+    row_xs = (_lattice(spacing, spacing, w), _lattice(spacing / 2, spacing, w))
+
+    # Flatten the lattice: rows alternate between the two x sequences, so
+    # tiling the (even, odd) pair and repeating each row's y lines them up.
+    counts = np.array([len(row_xs[0]), len(row_xs[1])])[np.arange(len(row_ys)) % 2]
+    pair = np.concatenate(row_xs)
+    xs = np.tile(pair, (len(row_ys) + 1) // 2)[:counts.sum()]
+    ys = np.repeat(row_ys, counts)
+
+    if inside is None:
+        inside = mask > 127
+    xi = np.rint(xs).astype(np.intp)
+    yi = np.rint(ys).astype(np.intp)
+    hit = (xi < w) & (yi < h)
+    hit[hit] = inside[yi[hit], xi[hit]]
+    xs, ys = xs[hit], ys[hit]
+
+    d = density_map[np.minimum(ys.astype(np.intp), h - 1),
+                    np.minimum(xs.astype(np.intp), w - 1)] / 255.0
+    rs = _radii(base_r, d, dens_mult, sizing_mode != "uniform")
+    dots = Dots(np.round(xs, 2), np.round(ys, 2), rs)
     if params.rotation != 0:
         dots = _rotate_points(dots, params.rotation, w / 2, h / 2)
 
@@ -284,7 +432,7 @@ def place_dots_contour_outline(
     mask: np.ndarray,
     density_map: np.ndarray,
     params,
-) -> List[Dict]:
+) -> Dots:
     """
     Walk the contours of the mask and place dots at even intervals.
     This gives the crisp rhinestone-outline look.
@@ -298,12 +446,16 @@ def place_dots_contour_outline(
     dens_mult = params.density
     sizing_mode = getattr(params, 'sizing_mode', 'variable')
 
-    dots: List[Dict] = []
+    found = []
+    count = 0
 
-    # Generate concentric contour rings via progressive erosion
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    # Generate concentric contour rings via progressive erosion.  Eroding
+    # k times by the 3x3 cross keeps exactly the pixels whose L1 distance
+    # to the background exceeds k, so one distance transform yields every
+    # ring by thresholding instead of re-eroding the mask per ring.
     erosion_step = max(2, int(spacing * 0.6))
-    current_mask = mask.copy()
+    depth = cv2.distanceTransform(mask, cv2.DIST_L1, 3)
+    current_mask = mask
 
     max_rings = 40  # safety limit
     ring = 0
@@ -311,7 +463,7 @@ def place_dots_contour_outline(
     start_time = time.time()
 
     while ring < max_rings:
-        if len(dots) >= MAX_DOTS or (time.time() - start_time) > 10.0:
+        if count >= MAX_DOTS or (time.time() - start_time) > 10.0:
             break
         # Check there's still shape left
         if cv2.countNonZero(current_mask) < 10:
@@ -331,32 +483,38 @@ def place_dots_contour_outline(
                 continue
 
             # Walk the contour placing dots at uniform spacing
-            accum = 0.0
-            n = len(contour)
-            for i in range(n):
-                p0 = contour[i][0]
-                p1 = contour[(i + 1) % n][0]
-                seg = math.hypot(p1[0] - p0[0], p1[1] - p0[1])
-                accum += seg
-
-                if accum >= spacing:
-                    px, py = float(p1[0]), float(p1[1])
-                    d = _density_at(density_map, px, py)
-                    r = _dot_radius(base_r, d, dens_mult, sizing_mode)
-
-                    dots.append({
-                        "x": round(px, 2),
-                        "y": round(py, 2),
-                        "r": round(r, 2),
-                    })
-                    accum = 0.0
+            pts = contour.reshape(-1, 2)
+            nxt = np.roll(pts, -1, axis=0)  # closed: last point joins the first
+            seg = (nxt - pts).astype(np.float64)
+            arc = np.cumsum(np.hypot(seg[:, 0], seg[:, 1]))
+
+            # A dot lands on the first vertex at least `spacing` of arc
+            # past the previous dot; only the dots are visited in Python.
+            picks = []
+            start = 0.0
+            while True:
+                i = int(np.searchsorted(arc, start + spacing))
+                if i >= len(arc):
+                    break
+                picks.append(i)
+                start = arc[i]
+            if not picks:
+                continue
+
+            xy = nxt[picks]
+            px, py = xy[:, 0], xy[:, 1]
+            d = density_map[np.clip(py, 0, h - 1), np.clip(px, 0, w - 1)] / 255.0
+            rs = _radii(base_r, d, dens_mult, sizing_mode != "uniform")
+            xs, ys = xy.astype(np.float64).T
+            found.append(Dots(xs, ys, rs))
+            count += len(picks)
 
         # Erode for next ring
-        current_mask = cv2.erode(current_mask, kernel, iterations=erosion_step)
         ring += 1
+        current_mask = cv2.compare(depth, ring * erosion_step, cv2.CMP_GT)
 
     # Remove overlaps globally
-    dots = remove_overlaps_spatial(dots, spacing * 0.55)
+    dots = remove_overlaps_spatial(Dots.concat(found), spacing * 0.55)
 
     if params.rotation != 0:
         dots = _rotate_points(dots, params.rotation, w / 2, h / 2)
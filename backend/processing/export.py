@@ -3,6 +3,7 @@ Export helpers: SVG → PNG / JPG conversion.
 """
 
 import io
+import sys
 from PIL import Image
 
 # cairosvg requires libcairo (a C library) to be installed on the system.
@@ -12,6 +13,7 @@ from PIL import Image
 # and return a helpful error only when PNG/JPG export is actually attempted.
 try:
     import cairosvg as _cairosvg
+    from cairosvg.surface import PNGSurface as _PNGSurface, Tree as _Tree
     _CAIRO_AVAILABLE = True
     _CAIRO_ERROR = None
 except Exception as e:
@@ -34,9 +36,24 @@ def svg_to_png(svg_string: str, scale: float = 2.0) -> bytes:
 
 
 def svg_to_jpg(svg_string: str, scale: float = 2.0, quality: int = 92) -> bytes:
-    """Convert SVG → PNG → JPG."""
-    png_bytes = svg_to_png(svg_string, scale=scale)
-    img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+    """Convert SVG → JPG, handing Cairo's pixels straight to Pillow."""
+    if not _CAIRO_AVAILABLE:
+        raise RuntimeError(_CAIRO_ERROR)
+    if sys.byteorder != "little":
+        # Pillow only unpacks Cairo's premultiplied ARGB32 in little-endian
+        # (B, G, R, a) byte order; elsewhere go through an encoded PNG.
+        png_bytes = svg_to_png(svg_string, scale=scale)
+        img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+    else:
+        # Render into an in-memory surface (output=None) and read it back,
+        # skipping the PNG deflate + inflate round trip on a full-size bitmap.
+        tree = _Tree(bytestring=svg_string.encode("utf-8"))
+        surface = _PNGSurface(tree, None, 96, scale=scale).cairo
+        surface.flush()
+        img = Image.frombuffer(
+            "RGBA", (surface.get_width(), surface.get_height()),
+            surface.get_data(), "raw", "BGRa", surface.get_stride(), 1,
+        ).convert("RGB")
     buf = io.BytesIO()
     img.save(buf, format="JPEG", quality=quality)
     return buf.getvalue()
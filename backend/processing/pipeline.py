@@ -10,12 +10,18 @@ KEY DESIGN PRINCIPLE:
 """
 
 import cv2
+import hashlib
 import numpy as np
 import logging
 import random
 import time
+from collections import OrderedDict
+from typing import Optional
+
+from scipy.spatial import cKDTree
 
 from .dot_placement import (
+    Dots,
     place_dots_poisson,
     place_dots_grid,
     place_dots_contour_outline,
@@ -23,6 +29,74 @@ from .dot_placement import (
 )
 
 
+def image_hasher():
+    """
+    Hasher for image fingerprints (cache keys, not security): BLAKE2b-128 is
+    roughly twice as fast as SHA-256 on MB-sized inputs and 128 bits is
+    plenty for deduplication.  Feed it chunks while reading to fuse hashing
+    with I/O.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+def is_reproducible(params) -> bool:
+    """
+    True when place_dots() gives the same dots every time for these params.
+    Poisson sampling (the default branch) and random shapes re-roll on each
+    call, so their results must not be served from a cache.
+    """
+    return (
+        params.method.lower() in ("grid", "contour")
+        and getattr(params, "dot_shape", "circle") != "random"
+    )
+
+
+# Every params field place_dots() reads, in a fixed order: the cache key is
+# built from these, so the web API (pydantic DotParams) and the CLI bridge
+# (ParamsObj dataclass) produce the same key for the same settings.
+_PARAM_FIELDS = (
+    "dot_radius", "min_spacing", "density", "method", "edge_strength",
+    "rotation", "contrast", "invert", "use_contour_follow", "dot_shape",
+    "sizing_mode", "canvas_width", "canvas_height",
+)
+
+
+class PlacementCache:
+    """
+    LRU of place_dots() results keyed by image hash + params — slider tweaks
+    often toggle back to a parameter set that was already rendered.  Params
+    that are not reproducible are never stored, so "Regenerate" still
+    re-rolls Poisson layouts and random shapes.
+    """
+
+    def __init__(self, size: int = 32):
+        self._size = size
+        self._results: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _key(image_hash: bytes, params) -> tuple:
+        return (image_hash,) + tuple(getattr(params, f) for f in _PARAM_FIELDS)
+
+    def get(self, image_hash: bytes, params) -> Optional[dict]:
+        if not is_reproducible(params):
+            return None
+        key = self._key(image_hash, params)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def put(self, image_hash: bytes, params, result: dict) -> None:
+        if not is_reproducible(params):
+            return
+        self._results[self._key(image_hash, params)] = result
+        if len(self._results) > self._size:
+            self._results.popitem(last=False)
+
+
 def _bytes_to_cv2(raw: bytes) -> np.ndarray:
     arr = np.frombuffer(raw, dtype=np.uint8)
     img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
@@ -31,6 +105,11 @@ def _bytes_to_cv2(raw: bytes) -> np.ndarray:
     return img
 
 
+# Structuring elements for mask cleanup, built once rather than per image.
+_K_ELLIPSE_3 = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+_K_ELLIPSE_5 = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+
 def _detect_foreground(gray: np.ndarray, invert: bool = False) -> np.ndarray:
     """
     Produce a clean binary mask:  255 = shape (foreground),  0 = background.
@@ -55,11 +134,8 @@ def _detect_foreground(gray: np.ndarray, invert: bool = False) -> np.ndarray:
         mask = 255 - mask
 
     # Morphology cleanup: remove small noise, fill small holes
-    k_small = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    k_med   = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN,  k_small, iterations=1)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, k_med,   iterations=2)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN,  _K_ELLIPSE_3, iterations=1)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _K_ELLIPSE_5, iterations=2)
 
     return mask
 
@@ -69,6 +145,7 @@ def _build_density_map(
     mask: np.ndarray,
     edge_strength: float,
     contrast: float,
+    inside: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Build a density map WITHIN the foreground mask only.
@@ -77,12 +154,16 @@ def _build_density_map(
     The density map now drives REAL variation in dot size to represent
     shadow (large dots) and highlight (small dots) like classic halftone.
     """
-    enhanced = gray.copy().astype(np.float32)
+    # gray is uint8, so the contrast curve only ever sees 256 distinct values:
+    # evaluate it once per level and look the result up per pixel, rather
+    # than computing both branches' powers over the whole image.
+    levels = np.arange(256, dtype=np.float32)
+    enhanced = gray  # uint8 image for Canny; only remapped if contrast moves
 
     # Contrast: apply S-curve for more dramatic effect
     if contrast != 1.0:
         # Normalize to 0-1
-        norm = enhanced / 255.0
+        norm = levels / 255.0
         # S-curve: stronger contrast pushes midtones toward extremes
         # Using power curve centered at 0.5
         midpoint = 0.5
@@ -98,40 +179,69 @@ def _build_density_map(
             # Decrease contrast: flatten curve
             gamma = contrast
             norm = midpoint + (norm - midpoint) * gamma
-        enhanced = np.clip(norm * 255.0, 0, 255).astype(np.float32)
+        levels = np.clip(norm * 255.0, 0, 255).astype(np.float32)
+        enhanced = cv2.LUT(gray, levels.astype(np.uint8))
+
+    # Per-pixel work below runs as a handful of in-place passes over one
+    # float32 image (plus the distance map, reused as scratch) instead of
+    # allocating a fresh temporary per expression.  The lookups go through
+    # cv2.LUT, several times faster than NumPy fancy indexing for uint8 keys.
 
     # Brightness → density: dark = high density, light = low density
     # This is the key halftone principle
-    brightness = (255.0 - enhanced) / 255.0  # 0=light, 1=dark
+    brightness = (255.0 - levels) / 255.0  # 0=light, 1=dark
 
     # Apply CLAHE-like local enhancement to bring out shadow/highlight detail
     brightness = np.clip(brightness, 0, 1)
 
     # Edge proximity from Canny + mask boundary
-    edges      = cv2.Canny(enhanced.astype(np.uint8), 30, 120)
+    edges      = cv2.Canny(enhanced, 30, 120)
     mask_edges = cv2.Canny(mask, 30, 120)
     all_edges  = cv2.bitwise_or(edges, mask_edges)
 
-    dist = cv2.distanceTransform(255 - all_edges, cv2.DIST_L2, 5)
-    max_dist = dist.max() + 1e-6
-    dist = dist / max_dist
-    edge_proximity = 1.0 - dist  # 1 at edges, 0 far away
+    # Distances are normalised and softened below, so they only need to be
+    # roughly Euclidean.  Compute them at half resolution (a 2x2 block is an
+    # edge if any of its pixels is, so 1-px Canny lines survive) and upsample:
+    # that halves the cost.  On logo-like images with sparse edges it is as
+    # accurate as full-res DIST_L2 with the 5x5 mask; where edges are only a
+    # few pixels apart (textured photos) the 2-px quantisation shows, moving
+    # density by up to ~40/255 at single pixels.
+    # No need to rescale the upsampled distances; the max-normalisation
+    # below cancels it.
+    h, w = all_edges.shape
+    small = cv2.resize(all_edges, ((w + 1) // 2, (h + 1) // 2), interpolation=cv2.INTER_AREA)
+    # 255 away from edges.  Compared against an array, not the scalar 0: for
+    # a 1x1 `small` OpenCV can't tell which operand is the scalar.
+    small = cv2.compare(small, np.zeros_like(small), cv2.CMP_EQ)
+    edge_proximity = cv2.resize(
+        cv2.distanceTransform(small, cv2.DIST_L2, 5), (w, h), interpolation=cv2.INTER_LINEAR
+    )
+    max_dist = edge_proximity.max() + 1e-6
+    edge_proximity /= max_dist
+    np.subtract(1.0, edge_proximity, out=edge_proximity)  # 1 at edges, 0 far away
 
     # Boost edge proximity so it has more effect
-    edge_proximity = np.power(edge_proximity, 0.6)  # push values up near edges
+    np.power(edge_proximity, 0.6, out=edge_proximity)  # push values up near edges
 
     # Blend brightness and edge proximity
-    density = brightness * (1.0 - edge_strength) + edge_proximity * edge_strength
+    density = cv2.LUT(gray, brightness)
+    density *= 1.0 - edge_strength
+    edge_proximity *= edge_strength
+    density += edge_proximity
 
     # Stretch result to use full 0-255 range within the mask (maximize dynamic range)
-    mask_pixels = density[mask > 127]
+    mask_pixels = density[mask > 127 if inside is None else inside]
     if len(mask_pixels) > 0:
-        lo, hi = np.percentile(mask_pixels, [2, 98])
+        # percentile() returns float64, and NumPy 2 promotes the whole image
+        # to match — pin the bounds to float32 so the stretch stays float32
+        lo, hi = np.percentile(mask_pixels, [2, 98]).astype(np.float32)
         if hi - lo > 0.01:
-            density = (density - lo) / (hi - lo)
-            density = np.clip(density, 0, 1)
+            density -= lo
+            density /= hi - lo
+            np.clip(density, 0, 1, out=density)
 
-    density_u8 = (density * 255).astype(np.uint8)
+    density *= 255
+    density_u8 = density.astype(np.uint8)
 
     # Zero out everything outside the mask
     density_u8[mask == 0] = 0
@@ -142,48 +252,104 @@ def _build_density_map(
 # public entry point
 # -----------------------------------------------------------------------
 
-def process_image(raw: bytes, params) -> dict:
+# Processing resolution cap (max dimension), for speed
+_MAX_PROC = 800
+
+
+def load_image(raw: bytes) -> dict:
     """
-    Returns {'dots': [{x, y, r}, …], 'image_width': …, 'image_height': …}
+    Decode and shrink to the processing cap — the part of the pipeline that
+    depends only on the image.  The result is at most 800 px on a side, so a
+    session can keep it in place of the (possibly multi-MB) upload bytes.
+
+    A canvas smaller than the cap is resized from this capped image, not the
+    original, i.e. resampled twice.  The mask edges come out slightly
+    different, so such canvases get a visibly different dot layout (a few to
+    a few dozen dots) than a single resize from the original would give.
+
+    Returns {'img', 'orig_w', 'orig_h', 'proc_scale'}
     """
     logger = logging.getLogger(__name__)
-    t0 = time.time()
 
     img = _bytes_to_cv2(raw)
     orig_h, orig_w = img.shape[:2]
     logger.info(f"Image decoded: {orig_w}x{orig_h}")
 
+    proc_scale = min(_MAX_PROC / orig_w, _MAX_PROC / orig_h, 1.0)
+    if proc_scale < 1.0:
+        size = (int(orig_w * proc_scale), int(orig_h * proc_scale))
+        img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+    return {"img": img, "orig_w": orig_w, "orig_h": orig_h, "proc_scale": proc_scale}
+
+
+def fit_to_canvas(source: dict, canvas_width: int, canvas_height: int) -> dict:
+    """
+    Fit a load_image() result to the canvas and blur.  Cache the result and
+    hand it to place_dots() so regenerate skips this prefix too.
+
+    Returns {'gray', 'canvas_size', 'scale', 'final_scale', 'orig_w', 'orig_h'}
+    """
+    orig_w, orig_h = source["orig_w"], source["orig_h"]
+    proc_scale = source["proc_scale"]
+
     # Fit into canvas keeping aspect ratio — downscale for performance
-    cw, ch = params.canvas_width, params.canvas_height
-    # Limit processing resolution to 800px max dimension for speed
-    max_proc = 800
-    proc_scale = min(max_proc / orig_w, max_proc / orig_h, 1.0)
+    cw, ch = canvas_width, canvas_height
     scale  = min(cw / orig_w, ch / orig_h)
     proc_w, proc_h = int(orig_w * min(scale, proc_scale)), int(orig_h * min(scale, proc_scale))
-    img = cv2.resize(img, (proc_w, proc_h), interpolation=cv2.INTER_AREA)
-
-    # We'll scale dots back to canvas coords later
-    final_scale = scale / min(scale, proc_scale)
+    img = source["img"]
+    if (proc_w, proc_h) != (img.shape[1], img.shape[0]):
+        img = cv2.resize(img, (proc_w, proc_h), interpolation=cv2.INTER_AREA)
 
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     gray = cv2.GaussianBlur(gray, (5, 5), 0)
 
+    return {
+        "gray": gray,
+        "canvas_size": (cw, ch),
+        "scale": scale,
+        # We'll scale dots back to canvas coords later
+        "final_scale": scale / min(scale, proc_scale),
+        "orig_w": orig_w,
+        "orig_h": orig_h,
+    }
+
+
+def decode_image(raw: bytes, canvas_width: int, canvas_height: int) -> dict:
+    """load_image() + fit_to_canvas() in one go."""
+    return fit_to_canvas(load_image(raw), canvas_width, canvas_height)
+
+
+def place_dots(decoded: dict, params) -> dict:
+    """
+    Mask → density map → dots for an image already run through fit_to_canvas().
+    Returns the same dict as process_image().
+    """
+    logger = logging.getLogger(__name__)
+    t0 = time.time()
+
+    gray = decoded["gray"]
+    proc_h, proc_w = gray.shape[:2]
+    final_scale = decoded["final_scale"]
+
     mask    = _detect_foreground(gray, invert=params.invert)
+    # Thresholded once here and shared by the density map and the placers
+    inside  = mask > 127
     fg_pct = cv2.countNonZero(mask) / (proc_w * proc_h) * 100
     logger.info(f"Foreground mask: {fg_pct:.1f}% of image, processed at {proc_w}x{proc_h}")
 
-    density = _build_density_map(gray, mask, params.edge_strength, params.contrast)
+    density = _build_density_map(gray, mask, params.edge_strength, params.contrast, inside)
     logger.info(f"Density map built in {time.time() - t0:.2f}s")
 
     method = params.method.lower()
     t1 = time.time()
 
     if method == "grid":
-        dots = place_dots_grid(mask, density, params)
+        dots = place_dots_grid(mask, density, params, inside)
     elif method == "contour":
         dots = place_dots_contour_outline(mask, density, params)
     else:  # "poisson" (default & best)
-        dots = place_dots_poisson(mask, density, params)
+        dots = place_dots_poisson(mask, density, params, inside)
 
     logger.info(f"Dot placement ({method}): {len(dots)} dots in {time.time() - t1:.2f}s")
 
@@ -196,49 +362,84 @@ def process_image(raw: bytes, params) -> dict:
 
     # Scale dots back to canvas coordinates if we downscaled for processing
     if final_scale > 1.001:
-        for d in dots:
-            d["x"] = round(d["x"] * final_scale, 2)
-            d["y"] = round(d["y"] * final_scale, 2)
-            d["r"] = round(d["r"] * final_scale, 2)
+        dots = Dots(
+            np.round(dots.xs * final_scale, 2),
+            np.round(dots.ys * final_scale, 2),
+            np.round(dots.rs * final_scale, 2),
+        )
 
     # Assign random shapes when dot_shape == "random"
+    shapes = None
     dot_shape = getattr(params, 'dot_shape', 'circle')
     if dot_shape == "random":
-        shape_choices = ["circle", "star", "diamond", "hexagon"]
-        for d in dots:
-            d["shape"] = random.choice(shape_choices)
+        shape_choices = np.array(["circle", "star", "diamond", "hexagon"])
+        # One vectorised draw, seeded from `random` like the Poisson sampler.
+        rng = np.random.default_rng(random.getrandbits(64))
+        shapes = shape_choices[rng.integers(len(shape_choices), size=len(dots))].tolist()
 
-    final_w = int(orig_w * scale)
-    final_h = int(orig_h * scale)
-    logger.info(f"Total processing: {len(dots)} dots in {time.time() - t0:.2f}s")
+    final_w = int(decoded["orig_w"] * decoded["scale"])
+    final_h = int(decoded["orig_h"] * decoded["scale"])
+    logger.info(f"Total placement: {len(dots)} dots in {time.time() - t0:.2f}s")
 
     return {
-        "dots": dots,
+        "dots": _to_columns(dots, shapes),
         "image_width": final_w,
         "image_height": final_h,
     }
 
 
-def _merge_dots(priority: list, secondary: list, min_dist: float) -> list:
+def process_image(raw: bytes, params) -> dict:
+    """
+    Returns {'dots': {'scale': 100, 'xs': […], 'ys': […], 'rs': […]},
+             'image_width': …, 'image_height': …}
+
+    Dots are columnar (one array per field; plus a 'shapes' list when
+    dot_shape == "random") to keep the JSON payload small.  xs / ys / rs
+    are int32 fixed-point: divide by dots['scale'] to get pixels (the
+    frontend's unpackDots does this).
+    """
+    decoded = decode_image(raw, params.canvas_width, params.canvas_height)
+    return place_dots(decoded, params)
+
+
+def _merge_dots(priority: Dots, secondary: Dots, min_dist: float) -> Dots:
     """Keep all *priority* dots; add *secondary* only where not overlapping."""
-    if not priority and not secondary:
-        return []
-    if not secondary:
+    if not len(secondary):
         return priority
-    if not priority:
+    if not len(priority):
         return secondary
 
-    merged = list(priority)
-    if not merged:
-        return secondary
+    # Drop secondaries that hit a priority dot, then resolve the survivors
+    # against each other with the same greedy pass as overlap removal.
+    nearest, _ = cKDTree(priority.xy()).query(secondary.xy(), k=1, distance_upper_bound=min_dist)
+    candidates = secondary.take(nearest >= min_dist)
+
+    return Dots.concat([priority, remove_overlaps_spatial(candidates, min_dist)])
+
+
+# Coordinates and radii leave the pipeline as int32 hundredths of a pixel.
+# Every value is already rounded to 2 decimals, so this is lossless, and it
+# covers the full 4000 px canvas (int16 / Q8.8 would top out at 128 px).
+_COORD_SCALE = 100
 
-    coords = np.array([[d["x"], d["y"]] for d in merged])
 
-    for d in secondary:
-        pt = np.array([d["x"], d["y"]])
-        dists = np.linalg.norm(coords - pt, axis=1)
-        if dists.min() >= min_dist:
-            merged.append(d)
-            coords = np.vstack([coords, pt])
+def _fixed(values) -> np.ndarray:
+    return np.rint(np.asarray(values, dtype=np.float64) * _COORD_SCALE).astype(np.int32)
 
-    return merged
+
+def _to_columns(dots: Dots, shapes: Optional[list] = None) -> dict:
+    """
+    Wire form of a Dots set: ``{"scale", "xs", "ys", "rs"[, "shapes"]}``.
+    ``xs``/``ys``/``rs`` are int32 arrays of fixed-point values, not floats:
+    callers must divide by ``scale`` (hundredths, see _COORD_SCALE) to get
+    pixels.  ``shapes`` is a plain list of shape names.
+    """
+    cols = {
+        "scale": _COORD_SCALE,
+        "xs": _fixed(dots.xs),
+        "ys": _fixed(dots.ys),
+        "rs": _fixed(dots.rs),
+    }
+    if shapes:
+        cols["shapes"] = shapes
+    return cols
@@ -4,31 +4,83 @@ Supports circle, diamond, star, hexagon shapes.
 """
 
 import math
-from typing import List, Dict
+from itertools import repeat
+from typing import List, Dict, Union
+
+
+# Unit-circle vertex directions, computed once: (radius factor, cos, sin).
+# Star points alternate outer (r) and inner (0.4 r) radii.
+_STAR_VERTS = tuple(
+    (1.0 if i % 2 == 0 else 0.4,
+     math.cos(-math.pi / 2 + i * math.pi / 5),
+     math.sin(-math.pi / 2 + i * math.pi / 5))
+    for i in range(10)
+)
+_HEX_VERTS = tuple(
+    (math.cos(-math.pi / 2 + i * math.pi / 3), math.sin(-math.pi / 2 + i * math.pi / 3))
+    for i in range(6)
+)
+_STAR_FMT = " ".join(["%.2f,%.2f"] * len(_STAR_VERTS))
+_HEX_FMT = " ".join(["%.2f,%.2f"] * len(_HEX_VERTS))
 
 
 def _star_points(cx: float, cy: float, r: float) -> str:
     """5-pointed star polygon points."""
-    outer, inner = r, r * 0.4
     pts = []
-    for i in range(10):
-        angle = -math.pi / 2 + i * math.pi / 5
-        rad = outer if i % 2 == 0 else inner
-        pts.append(f"{cx + rad * math.cos(angle):.2f},{cy + rad * math.sin(angle):.2f}")
-    return " ".join(pts)
+    for factor, c, s in _STAR_VERTS:
+        rad = r * factor
+        pts += (cx + rad * c, cy + rad * s)
+    return _STAR_FMT % tuple(pts)
 
 
 def _hex_points(cx: float, cy: float, r: float) -> str:
     """Regular hexagon polygon points."""
     pts = []
-    for i in range(6):
-        angle = -math.pi / 2 + i * math.pi / 3
-        pts.append(f"{cx + r * math.cos(angle):.2f},{cy + r * math.sin(angle):.2f}")
-    return " ".join(pts)
+    for c, s in _HEX_VERTS:
+        pts += (cx + r * c, cy + r * s)
+    return _HEX_FMT % tuple(pts)
+
+
+# %-templates: one C-level format per dot instead of an f-string per field
+# (%r on a float is the same repr an f-string would print)
+_CIRCLE = '  <circle cx="%r" cy="%r" r="%r" fill="%s"/>'
+_DIAMOND = '  <polygon points="%r,%r %r,%r %r,%r %r,%r" fill="%s"/>'
+_POLYGON = '  <polygon points="%s" fill="%s"/>'
+
+
+def _dot_element(cx, cy, r, color: str, shape: str) -> str:
+    """One SVG element for a single dot."""
+    if shape == "circle":
+        return _CIRCLE % (cx, cy, r, color)
+    elif shape == "diamond":
+        return _DIAMOND % (cx, cy - r, cx + r, cy, cx, cy + r, cx - r, cy, color)
+    elif shape == "star":
+        return _POLYGON % (_star_points(cx, cy, r), color)
+    elif shape == "hexagon":
+        return _POLYGON % (_hex_points(cx, cy, r), color)
+    return _CIRCLE % (cx, cy, r, color)
+
+
+def _as_list(values, scale=1) -> list:
+    # numpy arrays → plain floats (cheaper to format than numpy scalars);
+    # fixed-point columns are divided back to pixels here, once.
+    if hasattr(values, "tolist"):
+        return (values / scale).tolist() if scale != 1 else values.tolist()
+    return [v / scale for v in values] if scale != 1 else list(values)
 
 
-def dots_to_svg_string(dots: List[Dict], width: int, height: int, bg_color: str = "#111111", dot_shape: str = "circle") -> str:
-    """Build an SVG string from dot list."""
+def dots_to_svg_string(
+    dots: Union[List[Dict], Dict[str, list]],
+    width: int,
+    height: int,
+    bg_color: str = "#111111",
+    dot_shape: str = "circle",
+) -> str:
+    """
+    Build an SVG string from dots — either a list of {x, y, r[, color, shape]}
+    dicts (editor output) or columnar {xs, ys, rs[, shapes, scale]} (pipeline
+    output, where coordinates are fixed-point and ``scale`` units = 1 px).
+    """
     lines = [
         f'<svg xmlns="http://www.w3.org/2000/svg" '
         f'width="{width}" height="{height}" '
@@ -37,26 +89,32 @@ def dots_to_svg_string(dots: List[Dict], width: int, height: int, bg_color: str
     # Only add background rect if bg_color is not transparent/none
     if bg_color and bg_color.lower() not in ("none", "transparent"):
         lines.append(f'  <rect width="{width}" height="{height}" fill="{bg_color}"/>')
-    for d in dots:
-        cx = d.get("x", 0)
-        cy = d.get("y", 0)
-        r = d.get("r", 3)
-        color = d.get("color", "#CCCCCC")
-        shape = d.get("shape", dot_shape)
-
-        if shape == "diamond":
-            points = f"{cx},{cy - r} {cx + r},{cy} {cx},{cy + r} {cx - r},{cy}"
-            lines.append(f'  <polygon points="{points}" fill="{color}"/>')
-        elif shape == "star":
-            lines.append(f'  <polygon points="{_star_points(cx, cy, r)}" fill="{color}"/>')
-        elif shape == "hexagon":
-            lines.append(f'  <polygon points="{_hex_points(cx, cy, r)}" fill="{color}"/>')
+    if isinstance(dots, dict):
+        scale = dots.get("scale", 1)
+        xs = _as_list(dots["xs"], scale)
+        ys = _as_list(dots["ys"], scale)
+        rs = _as_list(dots["rs"], scale)
+        shapes = dots.get("shapes")
+        if not shapes and dot_shape not in ("diamond", "star", "hexagon"):
+            # All plain circles (the default): format the whole column at once
+            circle = _CIRCLE.replace("%s", "#CCCCCC")
+            lines.extend(map(circle.__mod__, zip(xs, ys, rs)))
         else:
-            lines.append(f'  <circle cx="{cx}" cy="{cy}" r="{r}" fill="{color}"/>')
+            for cx, cy, r, shape in zip(xs, ys, rs, shapes or repeat(dot_shape)):
+                lines.append(_dot_element(cx, cy, r, "#CCCCCC", shape))
+    else:
+        for d in dots:
+            lines.append(_dot_element(
+                d.get("x", 0),
+                d.get("y", 0),
+                d.get("r", 3),
+                d.get("color", "#CCCCCC"),
+                d.get("shape", dot_shape),
+            ))
     lines.append("</svg>")
     return "\n".join(lines)
 
 
-def generate_svg(dots: List[Dict], width: int, height: int) -> bytes:
+def generate_svg(dots: Union[List[Dict], Dict[str, list]], width: int, height: int) -> bytes:
     """Return SVG as bytes."""
     return dots_to_svg_string(dots, width, height).encode("utf-8")
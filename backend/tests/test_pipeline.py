@@ -0,0 +1,69 @@
+"""Regression tests for the image-processing pipeline."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from processing.pipeline import PlacementCache, _build_density_map, process_image  # noqa: E402
+
+
+def _params(**overrides):
+    params = dict(
+        dot_radius=4.0, min_spacing=10.0, density=1.0, method="grid",
+        edge_strength=0.6, rotation=0.0, contrast=1.2, invert=False,
+        use_contour_follow=False, dot_shape="circle", sizing_mode="uniform",
+        canvas_width=800, canvas_height=800,
+    )
+    params.update(overrides)
+    return SimpleNamespace(**params)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 2), (1, 5), (5, 1), (3, 3)])
+def test_density_map_tiny_images(shape):
+    gray = np.full(shape, 40, np.uint8)
+    mask = np.full(shape, 255, np.uint8)
+    density = _build_density_map(gray, mask, edge_strength=0.6, contrast=1.2)
+    assert density.shape == shape
+    assert density.dtype == np.uint8
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 2), (1, 5), (5, 1)])
+@pytest.mark.parametrize("method", ["grid", "poisson", "contour"])
+def test_process_image_tiny_images(shape, method):
+    raw = cv2.imencode(".png", np.full(shape + (3,), 40, np.uint8))[1].tobytes()
+    result = process_image(raw, _params(method=method))
+    assert set(result["dots"]) >= {"scale", "xs", "ys", "rs"}
+
+
+def test_placement_cache_key_matches_across_front_ends():
+    from cli_bridge import ParamsObj
+    from main import DotParams
+
+    cache = PlacementCache()
+    cache.put(b"img", DotParams(dot_radius=5, method="contour"), {"dots": "x"})
+    assert cache.get(b"img", ParamsObj(dot_radius=5.0, method="contour")) == {"dots": "x"}
+    assert cache.get(b"other", ParamsObj(dot_radius=5.0, method="contour")) is None
+
+
+@pytest.mark.parametrize("overrides", [{"method": "poisson"}, {"dot_shape": "random"}])
+def test_placement_cache_skips_stochastic_params(overrides):
+    cache = PlacementCache()
+    cache.put(b"img", _params(**overrides), {"dots": "x"})
+    assert len(cache) == 0
+    assert cache.get(b"img", _params(**overrides)) is None
+
+
+def test_placement_cache_evicts_least_recently_used():
+    cache = PlacementCache(size=2)
+    for radius in (1.0, 2.0):
+        cache.put(b"img", _params(dot_radius=radius), {"r": radius})
+    cache.get(b"img", _params(dot_radius=1.0))
+    cache.put(b"img", _params(dot_radius=3.0), {"r": 3.0})
+    assert cache.get(b"img", _params(dot_radius=2.0)) is None
+    assert cache.get(b"img", _params(dot_radius=1.0)) == {"r": 1.0}
@@ -96,6 +96,8 @@ function log(level, ...args) {
 let mainWindow = null;
 let bridgeProcess = null;
 let bridgeReady = false;
+// Length-prefixed binary frames, negotiated with {"cmd":"ping","binary":true}
+let bridgeBinary = false;
 
 // Sequential request queue (Python is single-threaded)
 const pendingRequests = [];
@@ -305,14 +307,21 @@ function findPip(pythonCmd) {
 // Python CLI Bridge — stdin/stdout JSON protocol
 // ═══════════════════════════════════════════════════════════════════════
 
-// Packages the CLI bridge needs (import-name → pip-name)
+// Packages the CLI bridge needs (import-name → pip-name).  `optional` ones are
+// accelerators the bridge can run without (JIT placement, fast JSON/base64):
+// they are installed along with the rest, but a failure to install them
+// does not block startup.
 const REQUIRED_PACKAGES = [
   { importName: "cv2", pipName: "opencv-python-headless" },
   { importName: "numpy", pipName: "numpy" },
+  { importName: "numba", pipName: "numba", optional: true },
   { importName: "skimage", pipName: "scikit-image" },
+  { importName: "scipy", pipName: "scipy" },
   { importName: "PIL", pipName: "Pillow" },
   { importName: "cairosvg", pipName: "cairosvg" },
   { importName: "shapely", pipName: "shapely" },
+  { importName: "orjson", pipName: "orjson", optional: true },
+  { importName: "pybase64", pipName: "pybase64", optional: true },
 ];
 
 /**
@@ -505,7 +514,7 @@ async function ensureDependencies() {
     return { ok: true, pythonCmd };
   }
 
-  const pipNames = missing.map((p) => p.pipName);
+  let pipNames = missing.map((p) => p.pipName);
   log("INFO", `Missing packages: ${pipNames.join(", ")}  — installing...`);
 
   // ── Show progress window ──
@@ -541,12 +550,12 @@ async function ensureDependencies() {
   // ── Build pip install args ──
   // On Linux/macOS we may need --break-system-packages (PEP 668 / externally-managed env)
   // or fall back to --user if that fails.
-  const buildPipInstallArgs = (extraFlags = []) => [
+  const buildPipInstallArgs = (names, extraFlags = []) => [
     ...pipInfo.args,
     "install",
     "--quiet",
     ...extraFlags,
-    ...pipNames,
+    ...names,
   ];
 
   const runPip = (args) =>
@@ -582,21 +591,35 @@ async function ensureDependencies() {
       });
     });
 
-  log("INFO", `pip command: ${pipInfo.cmd} ${buildPipInstallArgs().join(" ")}`);
+  const installPackages = async (names) => {
+    log("INFO", `pip command: ${pipInfo.cmd} ${buildPipInstallArgs(names).join(" ")}`);
 
-  // First attempt: plain install
-  let result = await runPip(buildPipInstallArgs());
+    // First attempt: plain install
+    let res = await runPip(buildPipInstallArgs(names));
 
-  // If it fails with "externally-managed" (PEP 668), retry with --break-system-packages
-  if (!result.success && result.error.includes("externally-managed")) {
-    log("WARN", "Retrying pip with --break-system-packages (PEP 668 env)");
-    result = await runPip(buildPipInstallArgs(["--break-system-packages"]));
-  }
+    // If it fails with "externally-managed" (PEP 668), retry with --break-system-packages
+    if (!res.success && res.error.includes("externally-managed")) {
+      log("WARN", "Retrying pip with --break-system-packages (PEP 668 env)");
+      res = await runPip(buildPipInstallArgs(names, ["--break-system-packages"]));
+    }
 
-  // If still failing, retry with --user
-  if (!result.success) {
-    log("WARN", "Retrying pip with --user flag");
-    result = await runPip(buildPipInstallArgs(["--user"]));
+    // If still failing, retry with --user
+    if (!res.success) {
+      log("WARN", "Retrying pip with --user flag");
+      res = await runPip(buildPipInstallArgs(names, ["--user"]));
+    }
+    return res;
+  };
+
+  let result = await installPackages(pipNames);
+
+  // An optional package (e.g. numba with no wheel for this Python yet) must
+  // not block the app: retry with just the required ones.
+  const requiredNames = missing.filter((p) => !p.optional).map((p) => p.pipName);
+  if (!result.success && requiredNames.length < pipNames.length) {
+    log("WARN", "Retrying pip without optional packages");
+    pipNames = requiredNames;
+    result = requiredNames.length ? await installPackages(requiredNames) : { success: true };
   }
 
   if (progressWin && !progressWin.isDestroyed()) progressWin.close();
@@ -669,60 +692,31 @@ async function startBridge() {
 
   log("INFO", `Bridge PID: ${bridgeProcess.pid}`);
 
-  // ── stdout: line-delimited JSON, sequential response matching ──
-  let buffer = "";
+  // ── stdout: line-delimited JSON until binary framing is negotiated,
+  //    then ">II" (header_len, payload_len) + header JSON + payload frames ──
+  let buffer = Buffer.alloc(0);
   bridgeProcess.stdout.on("data", (chunk) => {
-    buffer += chunk.toString();
-    const lines = buffer.split("\n");
-    buffer = lines.pop(); // keep incomplete tail
-    for (const line of lines) {
-      if (!line.trim()) continue;
-      try {
-        const msg = JSON.parse(line);
-        if (msg.status === "ready") {
-          log("INFO", "Bridge ready");
-          bridgeReady = true;
-          // flush pending
-          while (pendingRequests.length) {
-            requestQueue.push(pendingRequests.shift());
-          }
-          processQueue();
-          continue;
-        }
-        // Resolve current sequential request
-        if (currentRequest) {
-          const { resolve, reject, cmdName } = currentRequest;
-          currentRequest = null;
-          if (msg.ok === false) {
-            log(
-              "ERROR",
-              `Bridge cmd [${cmdName}] failed:`,
-              msg.error || "unknown",
-            );
-            reject(new Error(msg.error || "Bridge error"));
-          } else {
-            log(
-              "INFO",
-              `Bridge cmd [${cmdName}] ok — keys: ${Object.keys(msg).join(", ")}`,
-            );
-            resolve(msg);
-          }
-          processQueue();
-        }
-      } catch (e) {
-        log(
-          "ERROR",
-          "Bridge parse error:",
-          e.message,
-          "raw:",
-          line.substring(0, 200),
-        );
-        if (currentRequest) {
-          currentRequest.reject(e);
-          currentRequest = null;
-          processQueue();
-        }
+    buffer = Buffer.concat([buffer, chunk]);
+    for (;;) {
+      let line;
+      let payload = null;
+      if (bridgeBinary) {
+        if (buffer.length < 8) break;
+        const headerLen = buffer.readUInt32BE(0);
+        const payloadLen = buffer.readUInt32BE(4);
+        const end = 8 + headerLen + payloadLen;
+        if (buffer.length < end) break; // keep incomplete frame
+        line = buffer.toString("utf-8", 8, 8 + headerLen);
+        if (payloadLen) payload = buffer.subarray(8 + headerLen, end);
+        buffer = buffer.subarray(end);
+      } else {
+        const nl = buffer.indexOf(0x0a);
+        if (nl < 0) break; // keep incomplete tail
+        line = buffer.toString("utf-8", 0, nl);
+        buffer = buffer.subarray(nl + 1);
       }
+      if (!line.trim()) continue;
+      handleBridgeMessage(line, payload);
     }
   });
 
@@ -736,7 +730,7 @@ async function startBridge() {
       "Backend Error",
       `Failed to start the processing engine:\n${err.message}\n\n` +
         "Make sure Python 3.9+ is installed with:\n" +
-        "  pip install numpy opencv-python-headless scikit-image Pillow cairosvg shapely",
+        "  pip install numpy numba opencv-python-headless scikit-image scipy Pillow cairosvg shapely orjson pybase64",
     );
   });
 
@@ -744,6 +738,7 @@ async function startBridge() {
     log("WARN", `Bridge exited with code ${code}`);
     bridgeProcess = null;
     bridgeReady = false;
+    bridgeBinary = false;
     // reject inflight
     if (currentRequest) {
       currentRequest.reject(new Error("Bridge exited"));
@@ -754,6 +749,68 @@ async function startBridge() {
   });
 }
 
+/** Handle one bridge response (JSON header + optional raw payload). */
+function handleBridgeMessage(line, payload) {
+  try {
+    const msg = JSON.parse(line);
+    // Binary-mode exports carry the file as the frame payload
+    if (payload) msg.data_b64 = payload.toString("base64");
+    if (msg.status === "ready") {
+      log("INFO", "Bridge ready");
+      bridgeReady = true;
+      // flush pending
+      while (pendingRequests.length) {
+        requestQueue.push(pendingRequests.shift());
+      }
+      // Negotiate binary framing before anything else goes out
+      requestQueue.unshift({
+        payload: { cmd: "ping", binary: true },
+        resolve: (pong) => {
+          bridgeBinary = pong.binary === true;
+          log("INFO", `Bridge protocol: ${bridgeBinary ? "binary frames" : "JSON lines"}`);
+        },
+        reject: (e) => log("WARN", "Binary framing negotiation failed:", e.message),
+        cmdName: "negotiate",
+      });
+      processQueue();
+      return;
+    }
+    // Resolve current sequential request
+    if (currentRequest) {
+      const { resolve, reject, cmdName } = currentRequest;
+      currentRequest = null;
+      if (msg.ok === false) {
+        log(
+          "ERROR",
+          `Bridge cmd [${cmdName}] failed:`,
+          msg.error || "unknown",
+        );
+        reject(new Error(msg.error || "Bridge error"));
+      } else {
+        log(
+          "INFO",
+          `Bridge cmd [${cmdName}] ok — keys: ${Object.keys(msg).join(", ")}`,
+        );
+        resolve(msg);
+      }
+      processQueue();
+    }
+  } catch (e) {
+    log(
+      "ERROR",
+      "Bridge parse error:",
+      e.message,
+      "raw:",
+      line.substring(0, 200),
+    );
+    if (currentRequest) {
+      currentRequest.reject(e);
+      currentRequest = null;
+      processQueue();
+    }
+  }
+}
+
 function processQueue() {
   if (currentRequest) return;
   if (requestQueue.length === 0) return;
@@ -765,12 +822,24 @@ function processQueue() {
     processQueue();
     return;
   }
-  const jsonStr = JSON.stringify(currentRequest.payload);
+  let data;
+  if (bridgeBinary) {
+    // Ship the image as raw frame payload instead of base64 inside the JSON
+    const { image_b64, ...header } = currentRequest.payload;
+    const headerBuf = Buffer.from(JSON.stringify(header), "utf-8");
+    const body = image_b64 ? Buffer.from(image_b64, "base64") : Buffer.alloc(0);
+    const prefix = Buffer.alloc(8);
+    prefix.writeUInt32BE(headerBuf.length, 0);
+    prefix.writeUInt32BE(body.length, 4);
+    data = Buffer.concat([prefix, headerBuf, body]);
+  } else {
+    data = JSON.stringify(currentRequest.payload) + "\n";
+  }
   log(
     "INFO",
-    `Sending cmd [${currentRequest.cmdName}] (${jsonStr.length} bytes)`,
+    `Sending cmd [${currentRequest.cmdName}] (${data.length} bytes)`,
   );
-  bridgeProcess.stdin.write(jsonStr + "\n");
+  bridgeProcess.stdin.write(data);
 }
 
 /** Send a command to the Python bridge and await the response. */
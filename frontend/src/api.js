@@ -20,17 +20,35 @@ function fileToBase64(file) {
   });
 }
 
+/**
+ * Upload/regenerate responses carry dots column-wise ({xs, ys, rs, shapes?})
+ * to keep the JSON small; the editor works with one {x, y, r} object per dot.
+ */
+function unpackDots(data) {
+  if (!data || !data.dots || Array.isArray(data.dots)) return data;
+  // Coordinates arrive as fixed-point integers; `scale` units = 1 px.
+  const { xs, ys, rs, shapes, scale = 1 } = data.dots;
+  const dots = new Array(xs.length);
+  for (let i = 0; i < xs.length; i++) {
+    const x = xs[i] / scale, y = ys[i] / scale, r = rs[i] / scale;
+    dots[i] = shapes ? { x, y, r, shape: shapes[i] } : { x, y, r };
+  }
+  return { ...data, dots };
+}
+
 // ═══════════════════════════════════════════════════════════════════════
 // Electron path — fully local via IPC to Python CLI bridge
 // ═══════════════════════════════════════════════════════════════════════
 
 async function electronUpload(file, canvasWidth = 800, canvasHeight = 800) {
   const b64 = await fileToBase64(file);
-  return window.electronAPI.uploadImage(b64, canvasWidth, canvasHeight);
+  return unpackDots(
+    await window.electronAPI.uploadImage(b64, canvasWidth, canvasHeight),
+  );
 }
 
 async function electronRegenerate(sessionId, params) {
-  return window.electronAPI.regenerateDots(sessionId, params);
+  return unpackDots(await window.electronAPI.regenerateDots(sessionId, params));
 }
 
 async function electronUpdateDots(sessionId, dots) {
@@ -78,7 +96,7 @@ async function webUpload(file, canvasWidth = 800, canvasHeight = 800) {
     { method: "POST", body: form },
   );
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  return unpackDots(await res.json());
 }
 
 async function webRegenerate(sessionId, params) {
@@ -88,7 +106,7 @@ async function webRegenerate(sessionId, params) {
     body: JSON.stringify({ session_id: sessionId, params }),
   });
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  return unpackDots(await res.json());
 }
 
 async function webUpdateDots(sessionId, dots) {